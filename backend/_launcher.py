@@ -0,0 +1,60 @@
+"""
+Shared uvicorn launch settings for ``run_server.py`` and ``server_entry.py``.
+
+Both launchers resolve their configuration (command line, environment)
+and then call ``launch``, so server settings are defined in one place.
+"""
+
+import os
+from typing import Any
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag ("true", "1", "yes") from the environment."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("true", "1", "yes")
+
+
+def launch(
+    host: str,
+    port: int,
+    *,
+    workers: int = 1,
+    reload: bool = False,
+    access_log: bool = False,
+    app: Any = None,
+) -> None:
+    """
+    Run the QKD-Lab API server until it is stopped.
+
+    Args:
+        host:       Interface to bind to.
+        port:       Port to bind to.
+        workers:    Number of server worker processes.
+        reload:     Restart on source changes (development only).
+        access_log: Log every request. Off by default: access lines are
+                    written synchronously on the request path.
+        app:        Already imported application object. Used only for a
+                    single worker without reload; otherwise uvicorn needs
+                    the ``"main:app"`` import string.
+    """
+    import uvicorn
+
+    use_object = app is not None and workers == 1 and not reload
+    uvicorn.run(
+        app if use_object else "main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        reload=reload,
+        # "auto" selects uvloop and httptools when installed (they are,
+        # via uvicorn[standard]) and falls back to asyncio / h11 where
+        # they are unavailable, e.g. uvloop on Windows.
+        loop="auto",
+        http="auto",
+        interface="asgi3",
+        log_level="info",
+        access_log=access_log,
+    )
@@ -14,6 +14,8 @@ Alice is the sender. She:
 import numpy as np
 from numpy.random import Generator
 
+from utils.bits import rng_bits
+
 
 def generate_bits(n: int, rng: Generator) -> np.ndarray:
     """
@@ -24,9 +26,10 @@ def generate_bits(n: int, rng: Generator) -> np.ndarray:
         rng: NumPy random generator instance.
 
     Returns:
-        1-D int8 array of shape (n,) with values in {0, 1}.
+        1-D uint64 array of shape (ceil(n / 64),): the bits packed
+        64 per word (see ``utils.bits``).
     """
-    return rng.integers(0, 2, size=n, dtype=np.int8)
+    return rng_bits(n, rng)
 
 
 def generate_bases(n: int, rng: Generator) -> np.ndarray:
@@ -42,6 +45,7 @@ def generate_bases(n: int, rng: Generator) -> np.ndarray:
         rng: NumPy random generator instance.
 
     Returns:
-        1-D int8 array of shape (n,) with values in {0, 1}.
+        1-D uint64 array of shape (ceil(n / 64),): the bases packed
+        64 per word (see ``utils.bits``).
     """
-    return rng.integers(0, 2, size=n, dtype=np.int8)
+    return rng_bits(n, rng)
@@ -0,0 +1,272 @@
+"""
+Chunked, batched BB84 simulation pipeline.
+
+The pipeline runs on blocks of at most ``CHUNK_PHOTONS`` photons. Every
+stage of a block — Alice, Eve, channel, Bob, sifting — completes while
+its packed working set is still cache-resident, and only the per-row
+sifted length and mismatch count are carried from block to block.
+
+A block may hold many independent transmissions of the same photon
+count laid end to end as a (rows, words) stream. The channel / noise /
+Eve parameters may differ per row, so Monte Carlo trials and sweep
+steps are simulated together instead of one call at a time.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.random import Generator
+
+from core.bob import generate_bases as bob_generate_bases
+from core.bob import measure as bob_measure
+from core.channel import count_detections, simulate_detection
+from core.eve import intercept_resend
+from core.sifting import SiftResult, sift_keys
+from utils.bits import (
+    SPARSE_P_MAX,
+    WORD_BITS,
+    n_words,
+    rng_streams,
+    tail_mask,
+)
+
+# Photons per block: keeps the 32-bit Bernoulli lanes (~256 KiB) and the
+# packed streams of one block L2-resident.
+CHUNK_PHOTONS = 1 << 16
+
+# Below this detection probability only the detected photons are
+# simulated (see ``simulate_sparse``).
+SPARSE_DETECTION_MAX = SPARSE_P_MAX
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    """Packed streams and sifting outcome of one simulated block."""
+
+    alice_bits: np.ndarray
+    """Alice's packed raw bits, shape (rows, words).
+
+    For ``simulate_sparse`` this and ``bob_bits`` cover the detected
+    photons only."""
+
+    bob_bits: np.ndarray
+    """Bob's packed measurement outcomes, shape (rows, words), valid at
+    sifted positions."""
+
+    sift: SiftResult
+    """Sift mask and per-row sifted length / mismatch counts."""
+
+
+def simulate_chunk(
+    n: int,
+    rows: int,
+    p_detect: float | np.ndarray,
+    noise: float | np.ndarray,
+    eve_probability: float | np.ndarray,
+    rng: Generator,
+) -> ChunkResult:
+    """
+    Simulate one block of *rows* independent transmissions of *n* photons.
+
+    Stages:
+        1. Alice generates random bits and bases.
+        2. (Optional) Eve performs intercept-resend attack.
+        3. Photons traverse the lossy channel (attenuation + detector η).
+        4. Bob chooses random bases and measures arriving photons.
+        5. Alice and Bob sift their keys (basis reconciliation).
+
+    Args:
+        n:               Photons emitted per row.
+        rows:            Number of independent transmissions.
+        p_detect:        Per-photon detection probability (see
+                         ``channel.detection_probability``).
+        noise:           Bit-flip probability per detected photon.
+        eve_probability: Eve's intercept probability (0 disables Eve).
+        rng:             NumPy random generator instance.
+
+    Each parameter is a scalar or an array of shape (rows,).
+
+    Returns:
+        ChunkResult with (rows, words) packed streams and per-row counts.
+    """
+    words = n_words(n)
+    lanes = rows * words * WORD_BITS
+
+    # ── Stage 1: Alice prepares qubits ────────────────────────────────────
+    # Alice's bits and bases and Bob's bases are all uniform bit streams
+    # of the same length (cf. ``alice.generate_bits`` / ``generate_bases``,
+    # ``bob.generate_bases``), so they come from a single generator call.
+    alice_bits, alice_bases, bob_bases = rng_streams(lanes, 3, rng)
+
+    # ── Stage 2: Eve's intercept-resend (optional) ────────────────────────
+    eve_active = bool(np.any(eve_probability > 0.0))
+    if eve_active:
+        eve_result = intercept_resend(
+            lanes, alice_bits, alice_bases, eve_probability, rng
+        )
+        effective_bits = eve_result.effective_bits
+        effective_bases = eve_result.effective_bases
+    else:
+        effective_bits = alice_bits
+        effective_bases = alice_bases
+
+    # ── Stage 3: Channel attenuation & detection ──────────────────────────
+    detected = simulate_detection(lanes, p_detect, rng).reshape(rows, words)
+    # Each row is padded to whole words; padding photons never count.
+    detected[:, -1] &= tail_mask(n)
+
+    # ── Stage 4: Bob measures ─────────────────────────────────────────────
+    # Without Eve, Bob's outcome only matters where sifting keeps it.
+    bob_bits = bob_measure(
+        effective_bits,
+        effective_bases,
+        bob_bases,
+        noise,
+        rng,
+        sifted_only=not eve_active,
+    )
+
+    # ── Stage 5: Basis reconciliation (sifting) ───────────────────────────
+    shape = (rows, words)
+    alice_bits = alice_bits.reshape(shape)
+    bob_bits = bob_bits.reshape(shape)
+    sift = sift_keys(
+        alice_bits,
+        bob_bits,
+        alice_bases.reshape(shape),
+        bob_bases.reshape(shape),
+        detected,
+    )
+
+    return ChunkResult(alice_bits=alice_bits, bob_bits=bob_bits, sift=sift)
+
+
+def simulate_sparse(
+    n: int,
+    p_detect: float,
+    noise: float,
+    eve_probability: float,
+    rng: Generator,
+) -> ChunkResult:
+    """
+    Simulate one transmission of *n* photons, following only detections.
+
+    For a lossy link most photons never reach Bob, and nothing Eve or Bob
+    does to them can affect the sifted key. Only the number of detections
+    is sampled (``count_detections``), and Alice's states are drawn for
+    those photons alone: each is a uniform bit and basis, independent of
+    which photons were detected. That compact stream
+    alone passes through Eve, Bob and sifting, so every random draw
+    scales with the number of detections, not with n.
+
+    Args:
+        n:               Photons emitted.
+        p_detect:        Per-photon detection probability (≪ 1).
+        noise:           Bit-flip probability per detected photon.
+        eve_probability: Eve's intercept probability (0 disables Eve).
+        rng:             NumPy random generator instance.
+
+    Returns:
+        ChunkResult with a single row covering the detected photons:
+        Alice's bits, Bob's bits and the sifting outcome.
+    """
+    k = count_detections(n, p_detect, rng)
+    sent_bits, sent_bases = rng_streams(k, 2, rng)
+
+    eve_active = eve_probability > 0.0 and k > 0
+    if eve_active:
+        eve_result = intercept_resend(k, sent_bits, sent_bases, eve_probability, rng)
+        effective_bits = eve_result.effective_bits
+        effective_bases = eve_result.effective_bases
+    else:
+        effective_bits = sent_bits
+        effective_bases = sent_bases
+
+    bob_bases = bob_generate_bases(k, rng)
+    bob_bits = bob_measure(
+        effective_bits,
+        effective_bases,
+        bob_bases,
+        noise,
+        rng,
+        sifted_only=not eve_active,
+    )
+
+    # Every photon in the compact stream was detected.
+    arrived = np.full(n_words(k), tail_mask(WORD_BITS), dtype=np.uint64)
+    if k:
+        arrived[-1] = tail_mask(k)
+    sift = sift_keys(
+        sent_bits[None],
+        bob_bits[None],
+        sent_bases[None],
+        bob_bases[None],
+        arrived[None],
+    )
+
+    return ChunkResult(alice_bits=sent_bits[None], bob_bits=bob_bits[None], sift=sift)
+
+
+def simulate_batch(
+    n: int,
+    rows: int,
+    p_detect: float | np.ndarray,
+    noise: float | np.ndarray,
+    eve_probability: float | np.ndarray,
+    rng: Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run *rows* independent BB84 transmissions of *n* photons each.
+
+    Rows whose detection probability is below ``SPARSE_DETECTION_MAX``
+    are simulated one at a time over their detections only. The rest
+    are dense: short rows are packed several to a block, long rows are
+    split into blocks of ``CHUNK_PHOTONS``. Blocks draw from *rng* in
+    order, so a seeded generator gives reproducible results.
+
+    Args:
+        n:               Photons emitted per row.
+        rows:            Number of independent transmissions.
+        p_detect:        Per-photon detection probability (see
+                         ``channel.detection_probability``).
+        noise:           Bit-flip probability per detected photon.
+        eve_probability: Eve's intercept probability (0 disables Eve).
+        rng:             NumPy random generator instance.
+
+    Each parameter is a scalar or an array of shape (rows,).
+
+    Returns:
+        (sifted_length, mismatches): int64 arrays of shape (rows,).
+    """
+    params = [
+        np.broadcast_to(np.asarray(v, dtype=np.float64), (rows,))
+        for v in (p_detect, noise, eve_probability)
+    ]
+    sifted_length = np.zeros(rows, dtype=np.int64)
+    mismatches = np.zeros(rows, dtype=np.int64)
+
+    sparse = params[0] < SPARSE_DETECTION_MAX
+    for row in np.flatnonzero(sparse):
+        result = simulate_sparse(n, *(float(v[row]) for v in params), rng)
+        sifted_length[row] = result.sift.sifted_length[0]
+        mismatches[row] = result.sift.mismatches[0]
+
+    dense = np.flatnonzero(~sparse)
+    if len(dense) == 0:
+        return sifted_length, mismatches
+    params = [v[dense] for v in params]
+
+    chunk = min(n, CHUNK_PHOTONS)
+    group = max(1, CHUNK_PHOTONS // (n_words(chunk) * WORD_BITS))
+    for row in range(0, len(dense), group):
+        rows_in_group = dense[row : row + group]
+        for start in range(0, n, chunk):
+            result = simulate_chunk(
+                min(chunk, n - start),
+                len(rows_in_group),
+                *(v[row : row + group] for v in params),
+                rng,
+            )
+            sifted_length[rows_in_group] += result.sift.sifted_length
+            mismatches[rows_in_group] += result.sift.mismatches
+    return sifted_length, mismatches
@@ -15,11 +15,21 @@ where the transmittance is:
 with α the fiber attenuation coefficient (dB/km) and L the link distance (km).
 """
 
+import math
+
 import numpy as np
 from numpy.random import Generator
 
+from utils.bits import bernoulli_mask
+
+# 10^(−x / 10) = exp(−x · ln 10 / 10)
+_LN10_OVER_10 = math.log(10.0) / 10.0
+
 
-def transmittance(alpha: float, distance: float) -> float:
+def transmittance(
+    alpha: float | np.ndarray,
+    distance: float | np.ndarray,
+) -> float | np.ndarray:
     """
     Compute the channel transmittance.
 
@@ -27,6 +37,9 @@ def transmittance(alpha: float, distance: float) -> float:
 
     For typical telecom fiber at 1550 nm, α ≈ 0.2 dB/km.
 
+    Evaluated as a single exp with the ln 10 / 10 factor folded in:
+    ``math.exp`` for scalars, ``np.exp`` when a sweep passes arrays.
+
     Args:
         alpha:    Attenuation coefficient in dB/km (≥ 0).
         distance: Fiber link length in km (≥ 0).
@@ -34,14 +47,17 @@ def transmittance(alpha: float, distance: float) -> float:
     Returns:
         Channel transmittance T ∈ (0, 1].
     """
-    return 10.0 ** (-alpha * distance / 10.0)
+    x = -alpha * distance * _LN10_OVER_10
+    if isinstance(x, np.ndarray):
+        return np.exp(x)
+    return math.exp(x)
 
 
 def detection_probability(
-    alpha: float,
-    distance: float,
-    detector_efficiency: float,
-) -> float:
+    alpha: float | np.ndarray,
+    distance: float | np.ndarray,
+    detector_efficiency: float | np.ndarray,
+) -> float | np.ndarray:
     """
     Compute the overall per-photon detection probability.
 
@@ -61,26 +77,49 @@ def detection_probability(
 
 def simulate_detection(
     n: int,
-    alpha: float,
-    distance: float,
-    detector_efficiency: float,
+    p_detect: float | np.ndarray,
     rng: Generator,
 ) -> np.ndarray:
     """
     Simulate stochastic photon detection through a lossy channel.
 
     Each of the n emitted photons independently survives with
-    probability P_detect = T × η_detector.
+    probability P_detect = T × η_detector. The probability is computed
+    once per run with ``detection_probability`` and passed in, rather
+    than re-derived for every block of photons. It may be a per-segment
+    array (see ``utils.bits.bernoulli_mask``), which lets batched runs
+    vary the channel from row to row.
 
     Args:
-        n:                   Number of emitted photons.
-        alpha:               Attenuation coefficient (dB/km).
-        distance:            Link distance (km).
-        detector_efficiency: Detector efficiency η ∈ (0, 1].
-        rng:                 NumPy random generator instance.
+        n:        Number of emitted photons.
+        p_detect: Per-photon detection probability ∈ [0, 1].
+        rng:      NumPy random generator instance.
+
+    Returns:
+        Packed uint64 detection mask (see ``utils.bits``): bit set if the
+        photon was detected by Bob. Padding bits past n are zero.
+    """
+    return bernoulli_mask(n, p_detect, rng)
+
+
+def count_detections(
+    n: int,
+    p_detect: float,
+    rng: Generator,
+) -> int:
+    """
+    Sample how many of *n* photons are detected, without their positions.
+
+    Equivalent in distribution to ``popcount(simulate_detection(...))``
+    (Binomial(n, p_detect)), at O(1) cost. Enough when the detected
+    photons' states do not depend on where they sat in the stream.
+
+    Args:
+        n:        Number of emitted photons.
+        p_detect: Per-photon detection probability ∈ [0, 1].
+        rng:      NumPy random generator instance.
 
     Returns:
-        Boolean array of shape (n,): True if photon detected by Bob.
+        Number of detected photons.
     """
-    p_detect = detection_probability(alpha, distance, detector_efficiency)
-    return rng.random(n) < p_detect
+    return int(rng.binomial(n, p_detect))
@@ -28,68 +28,130 @@ from dataclasses import dataclass
 import numpy as np
 from numpy.random import Generator
 
+from utils.bits import (
+    SPARSE_P_MAX,
+    bernoulli_mask,
+    bernoulli_positions,
+    flip_bits,
+    popcount,
+    rng_bits,
+    unpack_bits,
+)
+
 
 @dataclass(frozen=True)
 class EveResult:
-    """Encapsulates the outcome of Eve's intercept-resend attack."""
+    """
+    Encapsulates the outcome of Eve's intercept-resend attack.
+
+    When nothing was intercepted the effective streams *are* Alice's
+    arrays (no copy); treat them as read-only.
+    """
 
     effective_bits: np.ndarray
-    """Bit values of photon states after Eve's intervention."""
+    """Packed bit values of photon states after Eve's intervention."""
 
     effective_bases: np.ndarray
-    """Encoding bases of photon states after Eve's intervention."""
+    """Packed encoding bases of photon states after Eve's intervention."""
 
     intercepted_count: int
     """Number of photons Eve actually intercepted."""
 
 
 def intercept_resend(
+    n: int,
     alice_bits: np.ndarray,
     alice_bases: np.ndarray,
-    eve_probability: float,
+    eve_probability: float | np.ndarray,
     rng: Generator,
 ) -> EveResult:
     """
     Execute Eve's intercept-resend attack on a photon stream.
 
     Args:
-        alice_bits:      Alice's encoded bit values (0 or 1).
-        alice_bases:     Alice's encoding bases (0 = Z, 1 = X).
-        eve_probability: Probability that Eve intercepts any given photon.
+        n:               Number of photons in the stream.
+        alice_bits:      Alice's packed bit values (see ``utils.bits``).
+        alice_bases:     Alice's packed encoding bases (0 = Z, 1 = X).
+        eve_probability: Probability that Eve intercepts any given photon
+                         (scalar, or per segment — see ``bernoulli_mask``).
         rng:             NumPy random generator instance.
 
     Returns:
-        EveResult containing effective bits/bases after eavesdropping
-        and the count of intercepted photons.
+        EveResult containing packed effective bits/bases after
+        eavesdropping and the count of intercepted photons.
     """
-    n = len(alice_bits)
+    if np.ndim(eve_probability) == 0 and eve_probability < SPARSE_P_MAX:
+        return _intercept_sparse(n, alice_bits, alice_bases, eve_probability, rng)
 
     # --- determine which photons Eve intercepts ---
-    intercepted = rng.random(n) < eve_probability
-    intercepted_count = int(np.sum(intercepted))
+    intercepted = bernoulli_mask(n, eve_probability, rng)
+    intercepted_count = popcount(intercepted)
 
     if intercepted_count == 0:
         return EveResult(
-            effective_bits=alice_bits.copy(),
-            effective_bases=alice_bases.copy(),
+            effective_bits=alice_bits,
+            effective_bases=alice_bases,
             intercepted_count=0,
         )
 
     # --- Eve's random measurement bases ---
-    eve_bases = rng.integers(0, 2, size=n, dtype=np.int8)
+    # Photons Eve intercepted *and* measured in the wrong basis are the
+    # only ones whose state changes; everything below is one fused sweep
+    # of in-place word operations over that mask.
+    basis_flipped = rng_bits(n, rng)
+    basis_flipped ^= alice_bases
+    basis_flipped &= intercepted
 
     # --- Eve's measurement outcomes ---
-    # Matching basis → correct bit; mismatching → random bit
-    eve_basis_correct = eve_bases == alice_bases
-    random_outcomes = rng.integers(0, 2, size=n, dtype=np.int8)
-    eve_measured = np.where(
-        eve_basis_correct, alice_bits, random_outcomes
-    ).astype(np.int8)
-
-    # --- Construct effective state after Eve ---
-    # Non-intercepted photons retain Alice's original state
-    effective_bits = np.where(intercepted, eve_measured, alice_bits).astype(np.int8)
-    effective_bases = np.where(intercepted, eve_bases, alice_bases).astype(np.int8)
+    # Matching basis → correct bit; mismatching → random bit, resent in
+    # Eve's basis. Non-intercepted photons retain Alice's original state.
+    effective_bits = rng_bits(n, rng)
+    effective_bits ^= alice_bits
+    effective_bits &= basis_flipped
+    effective_bits ^= alice_bits
+
+    return EveResult(
+        effective_bits=effective_bits,
+        effective_bases=alice_bases ^ basis_flipped,
+        intercepted_count=intercepted_count,
+    )
+
+
+def _intercept_sparse(
+    n: int,
+    alice_bits: np.ndarray,
+    alice_bases: np.ndarray,
+    eve_probability: float,
+    rng: Generator,
+) -> EveResult:
+    """
+    Intercept-resend for a rarely intercepting Eve.
+
+    Samples the intercepted positions directly and draws Eve's bases
+    and outcomes for those photons only, so RNG cost scales with the
+    intercepted count rather than with n.
+    """
+    intercepted = bernoulli_positions(n, eve_probability, rng)
+    intercepted_count = len(intercepted)
+
+    if intercepted_count == 0:
+        return EveResult(
+            effective_bits=alice_bits,
+            effective_bases=alice_bases,
+            intercepted_count=0,
+        )
+
+    # Eve's basis and outcome are uniform and independent of Alice's
+    # state, so "Eve's basis differs" and "resent bit differs" are each
+    # a fair coin per photon; the states that change are scattered back.
+    wrong_basis = unpack_bits(rng_bits(intercepted_count, rng), intercepted_count)
+    basis_flipped = intercepted[wrong_basis.view(bool)]
+    bit_differs = unpack_bits(rng_bits(len(basis_flipped), rng), len(basis_flipped))
+
+    effective_bits = alice_bits.copy()
+    effective_bases = alice_bases.copy()
+    flip_bits(effective_bases, basis_flipped)
+    flip_bits(effective_bits, basis_flipped[bit_differs.view(bool)])
 
     return EveResult(
         effective_bits=effective_bits,
@@ -13,29 +13,22 @@ QBER sources include:
 - Eavesdropper-induced disturbance
 """
 
-import numpy as np
 
-
-def calculate_qber(
-    alice_sifted: np.ndarray,
-    bob_sifted: np.ndarray,
-) -> tuple[float, int]:
+def calculate_qber(mismatches: int, sifted_length: int) -> float:
     """
-    Compute the Quantum Bit Error Rate from sifted keys.
+    Compute the Quantum Bit Error Rate from sifted-key counts.
+
+    The counts come straight from ``sift_keys``, which reads them off
+    the packed masks without materialising the sifted keys.
 
     Args:
-        alice_sifted: Alice's sifted key bits.
-        bob_sifted:   Bob's sifted key bits (same length).
+        mismatches:    Number of disagreeing sifted positions.
+        sifted_length: Number of bits in the sifted key.
 
     Returns:
-        (qber, mismatch_count):
-            qber           — error rate ∈ [0, 1]  (0.0 if sifted key is empty).
-            mismatch_count — absolute number of disagreeing positions.
+        QBER ∈ [0, 1]  (0.0 if the sifted key is empty).
     """
-    if len(alice_sifted) == 0:
-        return 0.0, 0
-
-    mismatches = int(np.sum(alice_sifted != bob_sifted))
-    qber = mismatches / len(alice_sifted)
+    if sifted_length == 0:
+        return 0.0
 
-    return qber, mismatches
+    return mismatches / sifted_length
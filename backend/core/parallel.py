@@ -0,0 +1,159 @@
+"""
+Process-parallel execution: the shared worker pool and Monte Carlo trials.
+
+CPU-bound request handlers run in the worker pool so they never block
+the server's event loop (see ``main``).
+
+Monte Carlo trials are independent, so they are split into fixed-size
+groups, each simulated with its own generator; for large runs
+(``fans_out``) every group goes to a worker process. Every group's
+generator is seeded from a child of one ``SeedSequence``
+(``utils.helpers.create_rng_batch``): the children are
+statistically independent streams, and because the grouping does not
+depend on the number of workers, a seeded run gives the same result on
+any machine.
+"""
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import numpy as np
+from numpy.random import Generator
+
+from core.batch import simulate_batch
+from utils.helpers import create_rng_batch
+
+# Trials simulated per worker task. Fixed (not derived from the CPU
+# count) so that seeded results are reproducible across machines.
+TRIALS_PER_TASK = 8
+
+# Below this many photons in total, process start-up and IPC cost more
+# than the simulation itself and trials run in-process.
+PARALLEL_MIN_PHOTONS = 1 << 24
+
+_executor: ProcessPoolExecutor | None = None
+# Guards ``_executor``: it is used from the event loop and from threads.
+_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared worker pool, creating it on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return _executor
+
+
+def discard_executor(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool that raised ``BrokenProcessPool``.
+
+    A pool that lost a worker process is unusable for good, so callers
+    discard it and retry once through ``get_executor``, which starts a
+    fresh one. Only the pool the caller used is dropped: if another
+    caller already replaced it, the replacement is kept.
+    """
+    global _executor
+    with _lock:
+        if _executor is pool:
+            _executor = None
+    pool.shutdown(wait=False)
+
+
+def shutdown() -> None:
+    """Stop the shared worker pool (it is re-created on next use)."""
+    global _executor
+    with _lock:
+        pool, _executor = _executor, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def fans_out(n: int, trials: int) -> bool:
+    """Whether ``simulate_trials`` spreads these trials over the pool."""
+    return (
+        (os.cpu_count() or 1) > 1
+        and trials > TRIALS_PER_TASK
+        and n * trials >= PARALLEL_MIN_PHOTONS
+    )
+
+
+def warm_up(task: Callable[[Any], Any], arg: Any) -> list[Future]:
+    """
+    Start every worker process ahead of the first request.
+
+    Workers are launched lazily and each must import NumPy and the
+    application modules before its first task, which would otherwise
+    land on the first request it serves. One small *task* is submitted
+    per worker to absorb that; this does not wait for them, so the
+    server can start serving while the workers boot.
+
+    Args:
+        task: Picklable (module-level) callable to run in each worker.
+        arg:  Its single argument.
+
+    Returns:
+        The submitted tasks' futures.
+    """
+    pool = get_executor()
+    return [pool.submit(task, arg) for _ in range(os.cpu_count() or 1)]
+
+
+def _run_group(
+    n: int,
+    rows: int,
+    p_detect: float,
+    noise: float,
+    eve_probability: float,
+    rng: Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    return simulate_batch(n, rows, p_detect, noise, eve_probability, rng)
+
+
+def simulate_trials(
+    n: int,
+    trials: int,
+    p_detect: float,
+    noise: float,
+    eve_probability: float,
+    seed: int | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run *trials* independent BB84 transmissions of *n* photons each.
+
+    Args:
+        n:               Photons emitted per trial.
+        trials:          Number of independent trials.
+        p_detect:        Per-photon detection probability.
+        noise:           Bit-flip probability per detected photon.
+        eve_probability: Eve's intercept probability (0 disables Eve).
+        seed:            Base seed; ``None`` → non-deterministic.
+
+    Returns:
+        (sifted_length, mismatches): int64 arrays of shape (trials,).
+    """
+    starts = range(0, trials, TRIALS_PER_TASK)
+    rngs = create_rng_batch(seed, len(starts))
+    groups = [
+        (n, min(TRIALS_PER_TASK, trials - start), p_detect, noise, eve_probability, rng)
+        for start, rng in zip(starts, rngs)
+    ]
+
+    if fans_out(n, trials):
+        pool = get_executor()
+        try:
+            results = list(pool.map(_run_group, *zip(*groups)))
+        except BrokenProcessPool:
+            discard_executor(pool)
+            results = list(get_executor().map(_run_group, *zip(*groups)))
+    else:
+        results = [_run_group(*group) for group in groups]
+
+    sifted_length = np.concatenate([r[0] for r in results])
+    mismatches = np.concatenate([r[1] for r in results])
+    return sifted_length, mismatches
@@ -17,7 +17,37 @@ meaning no secret key can be extracted — the channel is too noisy
 (or too heavily eavesdropped) for BB84.
 """
 
-from utils.entropy import binary_entropy
+import numpy as np
+
+from utils.entropy import binary_entropy, binary_entropy_vec
+
+
+def secure_fraction(
+    qber: float | np.ndarray,
+    ec_efficiency: float = 1.0,
+) -> float | np.ndarray:
+    """
+    Fraction of sifted bits that survive error correction and privacy
+    amplification.
+
+        max(0, 1 − H(Q) − f_EC · H(Q))
+
+    Both the secret key rate and the final key length scale this factor,
+    so callers needing both evaluate H(Q) only once.
+
+    Args:
+        qber:          Quantum Bit Error Rate ∈ [0, 1], scalar or array
+                       (e.g. one QBER per sweep step).
+        ec_efficiency: Error correction efficiency factor f_EC ≥ 1.0.
+
+    Returns:
+        Secure fraction ∈ [0, 1], with the same shape as *qber*.
+    """
+    if isinstance(qber, np.ndarray):
+        h = binary_entropy_vec(qber)
+        return np.maximum(0.0, 1.0 - (1.0 + ec_efficiency) * h)
+    h = binary_entropy(qber)
+    return max(0.0, 1.0 - (1.0 + ec_efficiency) * h)
 
 
 def secret_key_rate(
@@ -42,9 +72,7 @@ def secret_key_rate(
     Returns:
         Secret key rate ≥ 0 (bits per photon sent).
     """
-    h = binary_entropy(qber)
-    secure_capacity = 1.0 - (1.0 + ec_efficiency) * h
-    return max(0.0, sifted_fraction * secure_capacity)
+    return sifted_fraction * secure_fraction(qber, ec_efficiency)
 
 
 def estimate_final_key_length(
@@ -65,9 +93,7 @@ def estimate_final_key_length(
     Returns:
         Estimated final secure key length (integer, ≥ 0).
     """
-    h = binary_entropy(qber)
-    secure_fraction = max(0.0, 1.0 - (1.0 + ec_efficiency) * h)
-    return int(sifted_length * secure_fraction)
+    return int(sifted_length * secure_fraction(qber, ec_efficiency))
 
 
 def evaluate_security(qber: float, threshold: float) -> str:
@@ -15,22 +15,22 @@ from dataclasses import dataclass
 
 import numpy as np
 
+from utils.bits import WORD_BITS, popcount, unpack_bits
+
 
 @dataclass(frozen=True)
 class SiftResult:
     """Outcome of the key-sifting procedure."""
 
-    alice_sifted: np.ndarray
-    """Alice's bit values for sifted positions."""
-
-    bob_sifted: np.ndarray
-    """Bob's bit values for sifted positions."""
-
     sift_mask: np.ndarray
-    """Boolean mask indicating which original positions survived sifting."""
+    """Packed mask of the original positions that survived sifting."""
+
+    sifted_length: int | np.ndarray
+    """Number of bits in the sifted key (per row for 2-D inputs)."""
 
-    sifted_length: int
-    """Number of bits in the sifted key."""
+    mismatches: int | np.ndarray
+    """Number of sifted positions where Alice's and Bob's bits disagree
+    (per row for 2-D inputs)."""
 
 
 def sift_keys(
@@ -47,25 +47,59 @@ def sift_keys(
       1. The photon at that position was detected by Bob, AND
       2. Alice's encoding basis matches Bob's measurement basis.
 
+    All inputs are packed ``uint64`` words (see ``utils.bits``). The
+    sifted keys themselves are never materialised: the key length and
+    mismatch count are read straight off the packed masks, so the whole
+    step is a single pass over n / 64 words. Use ``sifted_bits`` to
+    extract a bounded prefix of a sifted key.
+
+    Inputs may also be 2-D (rows, words) batches of independent streams,
+    in which case the counts are per-row int64 arrays.
+
     Args:
-        alice_bits:  Alice's raw bit string.
-        bob_bits:    Bob's measurement outcomes (full array, including
+        alice_bits:  Alice's packed raw bit string.
+        bob_bits:    Bob's packed measurement outcomes (full array, including
                      undetected positions — these are masked out).
-        alice_bases: Alice's encoding bases.
-        bob_bases:   Bob's measurement bases.
-        detected:    Boolean array — True where a photon was detected.
+        alice_bases: Alice's packed encoding bases.
+        bob_bases:   Bob's packed measurement bases.
+        detected:    Packed detection mask — bit set where a photon was
+                     detected (zero in padding positions).
 
     Returns:
-        SiftResult with the sifted key pairs and metadata.
+        SiftResult with the sift mask, key length and mismatch count.
     """
-    sift_mask = (alice_bases == bob_bases) & detected
-
-    alice_sifted = alice_bits[sift_mask]
-    bob_sifted = bob_bits[sift_mask]
+    sift_mask = ~(alice_bases ^ bob_bases) & detected
+    axis = -1 if sift_mask.ndim > 1 else None
 
     return SiftResult(
-        alice_sifted=alice_sifted,
-        bob_sifted=bob_sifted,
         sift_mask=sift_mask,
-        sifted_length=int(np.sum(sift_mask)),
+        sifted_length=popcount(sift_mask, axis=axis),
+        mismatches=popcount(sift_mask & (alice_bits ^ bob_bits), axis=axis),
     )
+
+
+def sifted_bits(bits: np.ndarray, sift_mask: np.ndarray, max_bits: int) -> np.ndarray:
+    """
+    Extract the first *max_bits* sifted positions of a packed bit string.
+
+    Only a leading window of words is unpacked; the window doubles until
+    it holds enough sifted positions, so the cost tracks the sample size
+    rather than the full stream.
+
+    Args:
+        bits:      Packed bit string (Alice's or Bob's).
+        sift_mask: Packed sift mask from ``sift_keys``.
+        max_bits:  Maximum number of sifted bits to return.
+
+    Returns:
+        1-D int8 array of length ≤ max_bits with values in {0, 1}.
+    """
+    words = 1
+    while True:
+        window = min(words, len(sift_mask))
+        lanes = window * WORD_BITS
+        keep = unpack_bits(sift_mask[:window], lanes).view(bool)
+        sample = np.compress(keep, unpack_bits(bits[:window], lanes))
+        if len(sample) >= max_bits or window == len(sift_mask):
+            return sample[:max_bits]
+        words *= 2
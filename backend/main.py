@@ -11,8 +11,14 @@ All simulation logic lives in the ``core/`` package; this module
 orchestrates the pipeline and serves the HTTP API.
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+from collections.abc import Callable
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 
 from schemas import (
     SimulationRequest,
@@ -25,24 +31,69 @@ from schemas import (
     MonteCarloStats,
     GenericSweepRequest,
     GenericSweepResponse,
+    trusted,
 )
 
-from core.alice import generate_bits as alice_generate_bits
-from core.alice import generate_bases as alice_generate_bases
-from core.bob import generate_bases as bob_generate_bases
-from core.bob import measure as bob_measure
-from core.channel import simulate_detection
-from core.eve import intercept_resend
-from core.sifting import sift_keys
+from core.batch import (
+    CHUNK_PHOTONS,
+    SPARSE_DETECTION_MAX,
+    simulate_chunk,
+    simulate_sparse,
+)
+from core.channel import detection_probability
+from core.parallel import (
+    discard_executor,
+    fans_out,
+    get_executor,
+    shutdown,
+    simulate_trials,
+    warm_up,
+)
+from core.sifting import sifted_bits
 from core.metrics import calculate_qber
-from core.privacy import secret_key_rate, estimate_final_key_length, evaluate_security
+from core.privacy import secure_fraction, evaluate_security
+from core.sweep import SWEEP_KERNELS, simulate_sweep, sweep_metrics
 
-from utils.helpers import create_rng, sample_bits
+from utils.bits import rng_bits
+from utils.cache import TTLCache
+from utils.helpers import create_rng, encode_bits, sample_bits
 
 # ---------------------------------------------------------------------------
 # Application
 # ---------------------------------------------------------------------------
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the worker pool and warm the simulation paths before serving.
+
+    Runs one tiny simulation through the dense and the sparse (lossy
+    link) pipelines in-process, so the first requests do not pay for
+    lazy initialisation. The pool workers are warmed the same way in the
+    background: start-up (and the readiness line the desktop app waits
+    for) does not wait on worker processes booting. The pool is shut
+    down with the application.
+    """
+    warm = [
+        SimulationRequest(
+            photons=1000,
+            distance=distance,
+            noise=0.01,
+            eve_enabled=True,
+            eve_probability=0.5,
+            seed=0,
+        )
+        for distance in (0.0, 200.0)
+    ]
+    for request in warm:
+        run_simulation(request)
+    warm_up(run_simulation, warm[0])  # not awaited
+    yield
+    _responses.clear()
+    shutdown()
+
+
 app = FastAPI(
     title="QKD-Lab BB84 Simulator",
     description=(
@@ -51,6 +102,7 @@ app = FastAPI(
         "Shor–Preskill secret-key-rate estimation."
     ),
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -61,6 +113,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def _render(run: Callable[[BaseModel], BaseModel], request: BaseModel) -> str:
+    """
+    Run a pipeline and serialise its response model to JSON.
+
+    ``model_dump_json`` runs in pydantic-core, skipping the intermediate
+    dict / ``jsonable_encoder`` / ``json.dumps`` pass of the default
+    response path. The ``response_model`` declared on each route still
+    documents the payload in the OpenAPI schema.
+    """
+    return run(request).model_dump_json()
+
+
+# Serialised responses of seeded requests, keyed on (pipeline, request).
+# Request models are frozen, hence hashable and compared field by field.
+# Only touched from the event loop.
+_responses: TTLCache[str] = TTLCache(maxsize=64, ttl=600.0)
+
+
+async def _offload(
+    run: Callable[[BaseModel], BaseModel],
+    request: BaseModel,
+    *,
+    cacheable: bool = False,
+) -> Response:
+    """
+    Run a CPU-bound pipeline in the worker pool and await its JSON.
+
+    The event loop stays free to serve other requests meanwhile, and
+    the response is serialised in the worker too. If a worker process
+    died and broke the pool, the request is retried once on a fresh pool.
+
+    With *cacheable* (the request is seeded, so its response is fully
+    determined by it) the JSON is kept in ``_responses`` and a repeated
+    request is answered from there without running the pipeline.
+    """
+    key = (run, request) if cacheable else None
+    body = _responses.get(key) if cacheable else None
+    if body is None:
+        loop = asyncio.get_running_loop()
+        pool = get_executor()
+        try:
+            body = await loop.run_in_executor(pool, _render, run, request)
+        except BrokenProcessPool:
+            discard_executor(pool)
+            body = await loop.run_in_executor(get_executor(), _render, run, request)
+        if cacheable:
+            _responses.put(key, body)
+    return Response(body, media_type="application/json")
+
+
 # ---------------------------------------------------------------------------
 # Simulation pipeline
 # ---------------------------------------------------------------------------
@@ -70,13 +173,16 @@ def run_simulation(params: SimulationRequest) -> SimulationResponse:
     """
     Execute the complete BB84 simulation pipeline.
 
+    Stages 1–5 run block by block (see ``core.batch``); only the running
+    sifted length and mismatch count are kept between blocks.
+
     Stages:
         1. Alice generates random bits and bases.
         2. (Optional) Eve performs intercept-resend attack.
         3. Photons traverse the lossy channel (attenuation + detector η).
         4. Bob chooses random bases and measures arriving photons.
         5. Alice and Bob sift their keys (basis reconciliation).
-        6. QBER is computed from the sifted keys.
+        6. QBER is computed from the sifted-key mismatch count.
         7. Secret key rate and security status are evaluated.
 
     Args:
@@ -87,66 +193,89 @@ def run_simulation(params: SimulationRequest) -> SimulationResponse:
     """
     rng = create_rng(params.seed)
     n = params.photons
-
-    # ── Stage 1: Alice prepares qubits ────────────────────────────────────
-    alice_bits = alice_generate_bits(n, rng)
-    alice_bases = alice_generate_bases(n, rng)
-
-    # ── Stage 2: Eve's intercept-resend (optional) ────────────────────────
-    if params.eve_enabled and params.eve_probability > 0.0:
-        eve_result = intercept_resend(
-            alice_bits, alice_bases, params.eve_probability, rng
-        )
-        effective_bits = eve_result.effective_bits
-        effective_bases = eve_result.effective_bases
-    else:
-        effective_bits = alice_bits
-        effective_bases = alice_bases
-
-    # ── Stage 3: Channel attenuation & detection ──────────────────────────
-    detected = simulate_detection(
-        n, params.attenuation, params.distance, params.detector_efficiency, rng
+    eve_probability = params.eve_probability if params.eve_enabled else 0.0
+    p_detect = detection_probability(
+        params.attenuation, params.distance, params.detector_efficiency
     )
 
-    # ── Stage 4: Bob measures ─────────────────────────────────────────────
-    bob_bases = bob_generate_bases(n, rng)
-    bob_bits = bob_measure(effective_bits, effective_bases, bob_bases, params.noise, rng)
+    # ── Stages 1–5, one cache-sized block at a time ───────────────────────
+    # Only the running counts (and the bounded bit samples, taken from the
+    # leading blocks) outlive each block. On a lossy link a single sparse
+    # block follows the detected photons alone, and Alice's leading raw
+    # bits for the sample are drawn on their own.
+    raw_bits_sample: list[int] = []
+    if p_detect < SPARSE_DETECTION_MAX:
+        blocks = [simulate_sparse(n, p_detect, params.noise, eve_probability, rng)]
+        raw_bits_sample = sample_bits(rng_bits(min(n, 64), rng), n)
+    else:
+        blocks = (
+            simulate_chunk(
+                min(CHUNK_PHOTONS, n - start),
+                1,
+                p_detect,
+                params.noise,
+                eve_probability,
+                rng,
+            )
+            for start in range(0, n, CHUNK_PHOTONS)
+        )
 
-    # ── Stage 5: Basis reconciliation (sifting) ───────────────────────────
-    sift = sift_keys(alice_bits, bob_bits, alice_bases, bob_bases, detected)
+    sifted_length = 0
+    mismatches = 0
+    bob_bits_sample: list[int] = []
+    for chunk in blocks:
+        sifted_length += int(chunk.sift.sifted_length[0])
+        mismatches += int(chunk.sift.mismatches[0])
+
+        if not raw_bits_sample:
+            raw_bits_sample = sample_bits(chunk.alice_bits[0], n)
+        if len(bob_bits_sample) < 64 and chunk.sift.sifted_length[0] > 0:
+            bob_bits_sample += sifted_bits(
+                chunk.bob_bits[0],
+                chunk.sift.sift_mask[0],
+                64 - len(bob_bits_sample),
+            ).tobytes()
 
     # Guard: no sifted bits means we cannot extract any key
-    if sift.sifted_length == 0:
-        return SimulationResponse(
+    if sifted_length == 0:
+        return trusted(
+            SimulationResponse,
             qber=0.0,
             skr=0.0,
             total_photons=n,
             sifted_key_length=0,
             final_key_length=0,
-            raw_bits_sample=sample_bits(alice_bits),
+            raw_bits_sample=raw_bits_sample,
             bob_bits_sample=[],
+            raw_bits_sample_b64=encode_bits(raw_bits_sample),
+            bob_bits_sample_b64="",
             mismatches=0,
             security_status="COMPROMISED",
         )
 
     # ── Stage 6: QBER ────────────────────────────────────────────────────
-    qber, mismatches = calculate_qber(sift.alice_sifted, sift.bob_sifted)
+    # Mismatches were counted during sifting; no sifted arrays are built.
+    qber = calculate_qber(mismatches, sifted_length)
 
     # ── Stage 7: Secret key rate & security verdict ──────────────────────
-    sifted_fraction = sift.sifted_length / n
+    # SKR and final key length share one evaluation of H(Q).
     ec_eff = getattr(params, "ec_efficiency", 1.0)
-    skr = secret_key_rate(sifted_fraction, qber, ec_eff)
-    final_key_len = estimate_final_key_length(sift.sifted_length, qber, ec_eff)
+    fraction = secure_fraction(qber, ec_eff)
+    skr = sifted_length / n * fraction
+    final_key_len = int(sifted_length * fraction)
     status = evaluate_security(qber, params.qber_threshold)
 
-    return SimulationResponse(
+    return trusted(
+        SimulationResponse,
         qber=round(qber, 6),
         skr=round(skr, 6),
         total_photons=n,
-        sifted_key_length=sift.sifted_length,
+        sifted_key_length=sifted_length,
         final_key_length=final_key_len,
-        raw_bits_sample=sample_bits(alice_bits),
-        bob_bits_sample=sample_bits(sift.bob_sifted),
+        raw_bits_sample=raw_bits_sample,
+        bob_bits_sample=bob_bits_sample,
+        raw_bits_sample_b64=encode_bits(raw_bits_sample),
+        bob_bits_sample_b64=encode_bits(bob_bits_sample),
         mismatches=mismatches,
         security_status=status,
     )
@@ -158,7 +287,7 @@ def run_simulation(params: SimulationRequest) -> SimulationResponse:
 
 
 @app.post("/simulate", response_model=SimulationResponse)
-async def simulate(request: SimulationRequest) -> SimulationResponse:
+async def simulate(request: SimulationRequest) -> Response:
     """
     Run a full BB84 QKD simulation.
 
@@ -166,7 +295,7 @@ async def simulate(request: SimulationRequest) -> SimulationResponse:
     QBER, secret key rate, key lengths, bit samples, and a security verdict.
     """
     try:
-        return run_simulation(request)
+        return await _offload(run_simulation, request)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -178,80 +307,86 @@ async def simulate(request: SimulationRequest) -> SimulationResponse:
 import numpy as _np  # noqa: E402
 
 
+def _sweep_points(
+    xs: _np.ndarray, metrics: dict[str, _np.ndarray]
+) -> list[SweepPoint]:
+    """Build the sweep points from SoA metric arrays (already validated)."""
+    return [
+        trusted(
+            SweepPoint,
+            x=x,
+            qber=qber,
+            skr=skr,
+            sifted_key_length=k,
+            final_key_length=f,
+        )
+        for x, qber, skr, k, f in zip(
+            xs.tolist(),
+            metrics["qber"].tolist(),
+            metrics["skr"].tolist(),
+            metrics["sifted_key_length"].tolist(),
+            metrics["final_key_length"].tolist(),
+        )
+    ]
+
+
 def run_sweep(params: SweepRequest) -> SweepResponse:
-    """Run parameter sweeps over distance and noise."""
+    """
+    Run parameter sweeps over distance and noise.
+
+    Each sweep is simulated as one batch (one row per step).
+    """
     base_seed = params.seed
+    n = params.photons
+    eve_p = params.eve_probability if params.eve_enabled else 0.0
 
     # ── Distance sweep (fix noise, vary distance) ─────────────────────────
     distances = _np.linspace(
         params.distance_min, params.distance_max, params.distance_steps
-    ).tolist()
-    distance_points: list[SweepPoint] = []
-    for i, d in enumerate(distances):
-        req = SimulationRequest(
-            photons=params.photons,
-            distance=d,
-            attenuation=params.attenuation,
-            noise=params.noise,
-            detector_efficiency=params.detector_efficiency,
-            eve_enabled=params.eve_enabled,
-            eve_probability=params.eve_probability,
-            qber_threshold=params.qber_threshold,
-            ec_efficiency=params.ec_efficiency,
-            seed=(base_seed + i) if base_seed is not None else None,
-        )
-        res = run_simulation(req)
-        distance_points.append(
-            SweepPoint(
-                x=round(d, 2),
-                qber=res.qber,
-                skr=res.skr,
-                sifted_key_length=res.sifted_key_length,
-                final_key_length=res.final_key_length,
-            )
-        )
+    )
+    metrics = simulate_sweep(
+        n,
+        len(distances),
+        detection_probability(
+            params.attenuation, distances, params.detector_efficiency
+        ),
+        params.noise,
+        eve_p,
+        params.ec_efficiency,
+        create_rng(base_seed),
+    )
+    distance_points = _sweep_points(_np.round(distances, 2), metrics)
 
     # ── Noise sweep (fix distance at midpoint, vary noise) ────────────────
     mid_distance = (params.distance_min + params.distance_max) / 2.0
-    noises = _np.linspace(
-        params.noise_min, params.noise_max, params.noise_steps
-    ).tolist()
-    noise_points: list[SweepPoint] = []
-    for i, n in enumerate(noises):
-        req = SimulationRequest(
-            photons=params.photons,
-            distance=mid_distance,
-            attenuation=params.attenuation,
-            noise=n,
-            detector_efficiency=params.detector_efficiency,
-            eve_enabled=params.eve_enabled,
-            eve_probability=params.eve_probability,
-            qber_threshold=params.qber_threshold,
-            ec_efficiency=params.ec_efficiency,
-            seed=(base_seed + 1000 + i) if base_seed is not None else None,
-        )
-        res = run_simulation(req)
-        noise_points.append(
-            SweepPoint(
-                x=round(n, 4),
-                qber=res.qber,
-                skr=res.skr,
-                sifted_key_length=res.sifted_key_length,
-                final_key_length=res.final_key_length,
-            )
-        )
+    noises = _np.linspace(params.noise_min, params.noise_max, params.noise_steps)
+    metrics = simulate_sweep(
+        n,
+        len(noises),
+        detection_probability(
+            params.attenuation, mid_distance, params.detector_efficiency
+        ),
+        noises,
+        eve_p,
+        params.ec_efficiency,
+        create_rng((base_seed + 1000) if base_seed is not None else None),
+    )
+    noise_points = _sweep_points(_np.round(noises, 4), metrics)
 
-    return SweepResponse(
+    return trusted(
+        SweepResponse,
         distance_sweep=distance_points,
         noise_sweep=noise_points,
     )
 
 
 @app.post("/sweep", response_model=SweepResponse)
-async def sweep(request: SweepRequest) -> SweepResponse:
+async def sweep(request: SweepRequest) -> Response:
     """Run parameter sweeps to generate graph data."""
     try:
-        return run_sweep(request)
+        return await _offload(
+            run_sweep, request, cacheable=request.seed is not None
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -262,55 +397,64 @@ async def sweep(request: SweepRequest) -> SweepResponse:
 
 
 def run_monte_carlo(params: MonteCarloRequest) -> MonteCarloResponse:
-    """Run multiple simulation trials and aggregate statistics."""
-    qbers: list[float] = []
-    skrs: list[float] = []
-    sifted_lens: list[int] = []
-    final_lens: list[int] = []
-
-    for i in range(params.trials):
-        seed = (params.base_seed + i) if params.base_seed is not None else None
-        req = SimulationRequest(
-            photons=params.photons,
-            distance=params.distance,
-            attenuation=params.attenuation,
-            noise=params.noise,
-            detector_efficiency=params.detector_efficiency,
-            eve_enabled=params.eve_enabled,
-            eve_probability=params.eve_probability,
-            qber_threshold=params.qber_threshold,
-            ec_efficiency=params.ec_efficiency,
-            seed=seed,
-        )
-        res = run_simulation(req)
-        qbers.append(res.qber)
-        skrs.append(res.skr)
-        sifted_lens.append(res.sifted_key_length)
-        final_lens.append(res.final_key_length)
-
-    def _stats(values: list[float]) -> MonteCarloStats:
-        arr = _np.array(values)
-        return MonteCarloStats(
-            mean=round(float(arr.mean()), 6),
-            std=round(float(arr.std()), 6),
-            min_val=round(float(arr.min()), 6),
-            max_val=round(float(arr.max()), 6),
+    """
+    Run multiple simulation trials and aggregate statistics.
+
+    Trials are independent and are simulated in parallel across worker
+    processes, each group with its own generator spawned from
+    ``base_seed`` (see ``core.parallel``).
+    """
+    n = params.photons
+    sifted, mismatches = simulate_trials(
+        n,
+        params.trials,
+        detection_probability(
+            params.attenuation, params.distance, params.detector_efficiency
+        ),
+        params.noise,
+        params.eve_probability if params.eve_enabled else 0.0,
+        params.base_seed,
+    )
+    # One (trials, 4) array: columns qber, skr, sifted / final key length,
+    # reduced to one (4, 4) table of statistics and rounded in one pass.
+    metrics = sweep_metrics(n, sifted, mismatches, params.ec_efficiency)
+    results = _np.column_stack(
+        [metrics[k] for k in ("qber", "skr", "sifted_key_length", "final_key_length")]
+    ).astype(_np.float64)
+    table = _np.column_stack(
+        (
+            results.mean(axis=0),
+            results.std(axis=0),
+            results.min(axis=0),
+            results.max(axis=0),
         )
+    )
+    qber, skr, sifted_key_length, final_key_length = (
+        trusted(MonteCarloStats, mean=mean, std=std, min_val=lo, max_val=hi)
+        for mean, std, lo, hi in _np.round(table, 6).tolist()
+    )
 
-    return MonteCarloResponse(
+    return trusted(
+        MonteCarloResponse,
         trials=params.trials,
-        qber=_stats([float(v) for v in qbers]),
-        skr=_stats([float(v) for v in skrs]),
-        sifted_key_length=_stats([float(v) for v in sifted_lens]),
-        final_key_length=_stats([float(v) for v in final_lens]),
+        qber=qber,
+        skr=skr,
+        sifted_key_length=sifted_key_length,
+        final_key_length=final_key_length,
     )
 
 
 @app.post("/monte-carlo", response_model=MonteCarloResponse)
-async def monte_carlo(request: MonteCarloRequest) -> MonteCarloResponse:
+async def monte_carlo(request: MonteCarloRequest) -> Response:
     """Run Monte Carlo simulation with multiple trials."""
     try:
-        return run_monte_carlo(request)
+        if not fans_out(request.photons, request.trials):
+            return await _offload(run_monte_carlo, request)
+        # Large runs spread their trial groups over the worker pool
+        # themselves; wait on them from a thread so the event loop is
+        # not blocked.
+        body = await asyncio.to_thread(_render, run_monte_carlo, request)
+        return Response(body, media_type="application/json")
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -321,11 +465,14 @@ async def monte_carlo(request: MonteCarloRequest) -> MonteCarloResponse:
 
 
 def run_generic_sweep(params: GenericSweepRequest) -> GenericSweepResponse:
-    """Sweep a single parameter while holding others fixed."""
-    values = _np.linspace(
-        params.sweep_min, params.sweep_max, params.sweep_steps
-    ).tolist()
-    points: list[SweepPoint] = []
+    """
+    Sweep a single parameter while holding others fixed.
+
+    The sweep is simulated as one batch (one row per step). Both ends of
+    the range are validated as ``SimulationRequest``s, which covers every
+    step in between since each field's constraint is an interval.
+    """
+    values = _np.linspace(params.sweep_min, params.sweep_max, params.sweep_steps)
 
     base = dict(
         photons=params.photons,
@@ -338,32 +485,34 @@ def run_generic_sweep(params: GenericSweepRequest) -> GenericSweepResponse:
         qber_threshold=params.qber_threshold,
         ec_efficiency=params.ec_efficiency,
     )
+    for endpoint in (params.sweep_min, params.sweep_max):
+        SimulationRequest(**{**base, params.sweep_param: endpoint})
 
-    for i, v in enumerate(values):
-        req_dict = {**base, params.sweep_param: v}
-        req_dict["seed"] = (
-            (params.seed + 2000 + i) if params.seed is not None else None
-        )
-        req = SimulationRequest(**req_dict)
-        res = run_simulation(req)
-        points.append(
-            SweepPoint(
-                x=round(v, 6),
-                qber=res.qber,
-                skr=res.skr,
-                sifted_key_length=res.sifted_key_length,
-                final_key_length=res.final_key_length,
-            )
-        )
+    p_detect, noise, eve_p = SWEEP_KERNELS[params.sweep_param](base, values)
+    n = params.photons
+    metrics = simulate_sweep(
+        n,
+        len(values),
+        p_detect,
+        noise,
+        eve_p if params.eve_enabled else 0.0,
+        params.ec_efficiency,
+        create_rng((params.seed + 2000) if params.seed is not None else None),
+    )
+    points = _sweep_points(_np.round(values, 6), metrics)
 
-    return GenericSweepResponse(sweep_param=params.sweep_param, points=points)
+    return trusted(
+        GenericSweepResponse, sweep_param=params.sweep_param, points=points
+    )
 
 
 @app.post("/sweep/param", response_model=GenericSweepResponse)
-async def sweep_param(request: GenericSweepRequest) -> GenericSweepResponse:
+async def sweep_param(request: GenericSweepRequest) -> Response:
     """Sweep any single parameter."""
     try:
-        return run_generic_sweep(request)
+        return await _offload(
+            run_generic_sweep, request, cacheable=request.seed is not None
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -21,6 +21,7 @@ a = Analysis(
         ('utils', 'utils'),
         ('schemas.py', '.'),
         ('main.py', '.'),
+        ('_launcher.py', '.'),
     ],
     hiddenimports=[
         'uvicorn',
@@ -69,6 +70,11 @@ a = Analysis(
         'PIL',
         'scipy',
         'pandas',
+        'IPython',
+        'pytest',
+        'numpy.tests',
+        'numpy.f2py',
+        'numpy.distutils',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
@@ -89,7 +95,10 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX-packed libraries must be decompressed on every launch, on top
+    # of the one-file extraction; the size saving is not worth the
+    # slower sidecar start-up.
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=True,  # Keep console for server output
@@ -7,15 +7,19 @@ Cross-platform script to start the FastAPI backend server.
 Can be run standalone or bundled with the Tauri application.
 
 Usage:
-    python run_server.py [--host HOST] [--port PORT] [--reload]
+    python run_server.py [--host HOST] [--port PORT] [--workers N] [--reload]
+                         [--access-log | --no-access-log]
 
 Environment Variables:
     QKD_HOST    - Server host (default: 127.0.0.1)
     QKD_PORT    - Server port (default: 8000)
+    QKD_WORKERS - Server worker processes (default: 1)
     QKD_RELOAD  - Enable auto-reload (default: false)
+    QKD_ACCESS_LOG - Log every request (default: true, false when bundled)
 """
 
 import argparse
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -24,6 +28,8 @@ from pathlib import Path
 BACKEND_DIR = Path(__file__).parent.absolute()
 sys.path.insert(0, str(BACKEND_DIR))
 
+from _launcher import env_flag, launch  # noqa: E402
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -41,16 +47,31 @@ def main():
         default=int(os.environ.get("QKD_PORT", "8000")),
         help="Port to bind the server to (default: 8000)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("QKD_WORKERS", "1")),
+        help=(
+            "Number of server worker processes (default: 1). Each worker "
+            "runs its own Monte Carlo process pool sized to the CPU count."
+        ),
+    )
     parser.add_argument(
         "--reload",
         action="store_true",
-        default=os.environ.get("QKD_RELOAD", "").lower() in ("true", "1", "yes"),
+        default=env_flag("QKD_RELOAD"),
         help="Enable auto-reload for development",
     )
+    parser.add_argument(
+        "--access-log",
+        action=argparse.BooleanOptionalAction,
+        default=env_flag("QKD_ACCESS_LOG", not getattr(sys, "frozen", False)),
+        help="Log every request (default: on, off when bundled)",
+    )
     args = parser.parse_args()
 
     try:
-        import uvicorn
+        import uvicorn  # noqa: F401
     except ImportError:
         print("Error: uvicorn is not installed.")
         print("Please run: pip install -r requirements.txt")
@@ -59,18 +80,23 @@ def main():
     print(f"🔬 Starting QKD-Lab Backend Server...")
     print(f"   Host: {args.host}")
     print(f"   Port: {args.port}")
+    print(f"   Workers: {args.workers}")
     print(f"   Reload: {args.reload}")
+    print(f"   Access log: {args.access_log}")
     print(f"   API Docs: http://{args.host}:{args.port}/docs")
     print()
 
-    uvicorn.run(
-        "main:app",
-        host=args.host,
-        port=args.port,
+    launch(
+        args.host,
+        args.port,
+        workers=args.workers,
         reload=args.reload,
-        log_level="info",
+        access_log=args.access_log,
     )
 
 
 if __name__ == "__main__":
+    # Worker pool processes re-launch this script's executable when it is
+    # frozen (build_backend.py); they must not reach the argument parser.
+    multiprocessing.freeze_support()
     main()
@@ -2,9 +2,14 @@
 Pydantic request / response schemas for the BB84 simulation API.
 """
 
-from typing import Literal
+from typing import Any, Literal, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Request models are immutable and validated strictly: the frontend sends
+# typed JSON, so no coercion is attempted (JSON integers are still
+# accepted for float fields) and unknown fields are rejected.
+_REQUEST_CONFIG = ConfigDict(frozen=True, extra="forbid", strict=True)
 
 
 class SimulationRequest(BaseModel):
@@ -67,8 +72,9 @@ class SimulationRequest(BaseModel):
         description="Random seed for deterministic reproducibility. None → random.",
     )
 
-    model_config = {
-        "json_schema_extra": {
+    model_config = ConfigDict(
+        **_REQUEST_CONFIG,
+        json_schema_extra={
             "examples": [
                 {
                     "photons": 10000,
@@ -83,13 +89,15 @@ class SimulationRequest(BaseModel):
                     "seed": 42,
                 }
             ]
-        }
-    }
+        },
+    )
 
 
 class SweepRequest(BaseModel):
     """Parameters for a parameter-sweep across distance or noise."""
 
+    model_config = _REQUEST_CONFIG
+
     photons: int = Field(10_000, ge=100, le=10_000_000)
     attenuation: float = Field(0.2, ge=0.0, le=10.0)
     noise: float = Field(0.01, ge=0.0, le=0.5)
@@ -139,6 +147,8 @@ class SweepResponse(BaseModel):
 class MonteCarloRequest(BaseModel):
     """Parameters for Monte Carlo averaging over multiple simulation runs."""
 
+    model_config = _REQUEST_CONFIG
+
     photons: int = Field(10_000, ge=100, le=10_000_000)
     distance: float = Field(50.0, ge=0.0, le=1000.0)
     attenuation: float = Field(0.2, ge=0.0, le=10.0)
@@ -174,6 +184,8 @@ class MonteCarloResponse(BaseModel):
 class GenericSweepRequest(BaseModel):
     """Sweep any single parameter while holding others fixed."""
 
+    model_config = _REQUEST_CONFIG
+
     photons: int = Field(10_000, ge=100, le=10_000_000)
     distance: float = Field(50.0, ge=0.0, le=1000.0)
     attenuation: float = Field(0.2, ge=0.0, le=10.0)
@@ -219,10 +231,28 @@ class SimulationResponse(BaseModel):
         ..., description="Estimated secure key length after privacy amplification."
     )
     raw_bits_sample: list[int] = Field(
-        ..., description="Sample of Alice's raw bit string (up to 64 bits)."
+        ...,
+        description="Sample of Alice's raw bit string (up to 64 bits).",
+        deprecated="Use raw_bits_sample_b64.",
     )
     bob_bits_sample: list[int] = Field(
-        ..., description="Sample of Bob's sifted key bits (up to 64 bits)."
+        ...,
+        description="Sample of Bob's sifted key bits (up to 64 bits).",
+        deprecated="Use bob_bits_sample_b64.",
+    )
+    raw_bits_sample_b64: str = Field(
+        ...,
+        description=(
+            "raw_bits_sample packed MSB-first into bytes, base64-encoded. "
+            "Holds min(total_photons, 64) bits."
+        ),
+    )
+    bob_bits_sample_b64: str = Field(
+        ...,
+        description=(
+            "bob_bits_sample packed MSB-first into bytes, base64-encoded. "
+            "Holds min(sifted_key_length, 64) bits."
+        ),
     )
     mismatches: int = Field(
         ..., description="Absolute number of bit mismatches in the sifted key."
@@ -230,3 +260,21 @@ class SimulationResponse(BaseModel):
     security_status: Literal["SECURE", "COMPROMISED"] = Field(
         ..., description="Security classification based on QBER threshold."
     )
+
+
+# ---------------------------------------------------------------------------
+# Trusted construction
+# ---------------------------------------------------------------------------
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def trusted(model: type[ModelT], **fields: Any) -> ModelT:
+    """
+    Build a response model from values the backend computed itself.
+
+    Skips field validation (``model_construct``); callers must pass
+    plain Python values of the declared types. Request models, which
+    carry untrusted input, are always validated normally.
+    """
+    return model.model_construct(**fields)
@@ -7,6 +7,7 @@ This is the main entry point for the PyInstaller-bundled backend.
 It starts the uvicorn server with the FastAPI application.
 """
 
+import multiprocessing
 import os
 import sys
 import signal
@@ -21,12 +22,14 @@ if getattr(sys, 'frozen', False):
 
 def main():
     """Start the QKD-Lab backend server."""
-    import uvicorn
+    from _launcher import env_flag, launch
     from main import app
     
     # Get configuration from environment or use defaults
     host = os.environ.get("QKD_HOST", "127.0.0.1")
     port = int(os.environ.get("QKD_PORT", "8000"))
+    workers = int(os.environ.get("QKD_WORKERS", "1"))
+    access_log = env_flag("QKD_ACCESS_LOG")
     
     # Handle shutdown gracefully
     def signal_handler(signum, frame):
@@ -38,18 +41,16 @@ def main():
     
     print(f"🔬 QKD-Lab Backend Server")
     print(f"   Listening on: http://{host}:{port}")
+    print(f"   Workers: {workers}")
     print(f"   API Docs: http://{host}:{port}/docs")
     print()
     
-    # Run the server
-    uvicorn.run(
-        app,
-        host=host,
-        port=port,
-        log_level="info",
-        access_log=True,
-    )
+    # Passing the imported app (rather than only "main:app") lets
+    # PyInstaller trace the application modules.
+    launch(host, port, workers=workers, access_log=access_log, app=app)
 
 
 if __name__ == "__main__":
+    # Monte Carlo worker processes re-launch this executable when frozen.
+    multiprocessing.freeze_support()
     main()
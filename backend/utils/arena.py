@@ -0,0 +1,45 @@
+"""
+Per-thread scratch buffers for short-lived pipeline temporaries.
+
+Each simulated block needs the same handful of temporaries (Bernoulli
+comparison masks, popcount partial sums). Allocating them afresh for
+every block churns the allocator and evicts the block's working set
+from cache; instead, each thread keeps one buffer per name and hands out
+views of it. A buffer only grows when a larger size is requested.
+
+A view is valid until the next ``get`` with the same name on the same
+thread, so callers must consume it before returning — never hand one
+back to the caller.
+"""
+
+import math
+import threading
+
+import numpy as np
+
+_local = threading.local()
+
+
+def get(name: str, shape: int | tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """
+    Return an uninitialised scratch array for the current thread.
+
+    Args:
+        name:  Buffer identifier; distinct temporaries that are alive at
+               the same time must use distinct names.
+        shape: Shape of the requested array.
+        dtype: Element type of the requested array.
+
+    Returns:
+        A C-contiguous view of the thread's buffer for *name*.
+    """
+    try:
+        buffers = _local.buffers
+    except AttributeError:
+        buffers = _local.buffers = {}
+
+    count = shape if isinstance(shape, int) else math.prod(shape)
+    buf = buffers.get((name, dtype))
+    if buf is None or len(buf) < count:
+        buf = buffers[(name, dtype)] = np.empty(count, dtype=dtype)
+    return buf[:count].reshape(shape)
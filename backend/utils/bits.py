@@ -0,0 +1,240 @@
+"""
+Bit-packed array helpers for the BB84 simulation pipeline.
+
+Bits and bases are stored 64 per ``uint64`` word: bit *i* of the stream
+lives in bit ``i % 64`` of word ``i // 64``. Element-wise comparisons on
+{0, 1} values then become single bitwise operations over whole words:
+
+    a == b   →  ~(a ^ b)
+    a != b   →   a ^ b
+
+Lanes past the logical length *n* in the final word are padding. Stages
+may fill them with anything; masks built from length-*n* boolean arrays
+(e.g. detection) are zero there, so padding never survives sifting.
+"""
+
+import numpy as np
+from numpy.random import Generator
+
+from utils import arena
+
+WORD_BITS = 64
+
+# Below this success probability, sampling the positions of successes
+# (``bernoulli_positions``) beats drawing a full mask. NumPy's sampler
+# without replacement stays O(k) for k ≲ n / 20, so stay well under that.
+SPARSE_P_MAX = 1 / 32
+
+# SWAR popcount constants (used when NumPy lacks ``bitwise_count``).
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def n_words(n: int) -> int:
+    """Number of ``uint64`` words needed to hold *n* bits."""
+    return (n + WORD_BITS - 1) // WORD_BITS
+
+
+def tail_mask(n: int) -> np.uint64:
+    """Word with the low ``n % 64`` bits set (all bits if n fills the word)."""
+    r = n % WORD_BITS
+    return np.uint64((1 << r) - 1 if r else (1 << WORD_BITS) - 1)
+
+
+def rng_bits(n: int, rng: Generator) -> np.ndarray:
+    """
+    Draw *n* uniformly random bits, packed into ``uint64`` words.
+
+    Every bit of a raw bit-generator output is uniform, so one
+    ``random_raw`` word yields 64 bits at once.
+
+    Args:
+        n:   Number of random bits required.
+        rng: NumPy random generator instance.
+
+    Returns:
+        1-D uint64 array of shape (ceil(n / 64),).
+    """
+    return rng.bit_generator.random_raw(size=n_words(n))
+
+
+def rng_streams(n: int, count: int, rng: Generator) -> np.ndarray:
+    """
+    Draw *count* independent streams of *n* random bits in one call.
+
+    Equivalent to *count* calls of ``rng_bits`` but crosses into the
+    bit generator once, with the streams laid out row by row.
+
+    Args:
+        n:     Bits per stream.
+        count: Number of streams.
+        rng:   NumPy random generator instance.
+
+    Returns:
+        uint64 array of shape (count, ceil(n / 64)).
+    """
+    return rng.bit_generator.random_raw(size=count * n_words(n)).reshape(count, -1)
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack a {0, 1} or boolean array into ``uint64`` words.
+
+    Args:
+        bits: 1-D array of bit values.
+
+    Returns:
+        1-D uint64 array of shape (ceil(len(bits) / 64),), zero-padded.
+    """
+    packed = np.packbits(bits, bitorder="little")
+    pad = -len(packed) % (WORD_BITS // 8)
+    if pad:
+        packed = np.concatenate((packed, np.zeros(pad, dtype=np.uint8)))
+    return packed.view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_bits(words: np.ndarray, n: int) -> np.ndarray:
+    """
+    Unpack the first *n* bits of a packed stream.
+
+    Args:
+        words: 1-D uint64 array of packed bits.
+        n:     Number of bits to unpack.
+
+    Returns:
+        1-D int8 array of shape (n,) with values in {0, 1}.
+    """
+    raw = words.astype("<u8", copy=False).view(np.uint8)
+    return np.unpackbits(raw, count=n, bitorder="little").view(np.int8)
+
+
+def flip_bits(words: np.ndarray, positions: np.ndarray) -> None:
+    """
+    Toggle individual bits of a packed stream in place.
+
+    Args:
+        words:     1-D uint64 array of packed bits.
+        positions: Distinct bit positions to toggle (int64).
+    """
+    shift = (positions & (WORD_BITS - 1)).astype(np.uint64)
+    np.bitwise_xor.at(words, positions // WORD_BITS, np.uint64(1) << shift)
+
+
+def popcount(words: np.ndarray, axis: int | None = None) -> int | np.ndarray:
+    """
+    Count set bits in a packed array, 64 bits per operation.
+
+    Uses ``np.bitwise_count`` (hardware POPCNT, NumPy ≥ 2.0) when
+    available, else an in-place SWAR reduction over whole words. Callers
+    are responsible for padding bits: masks built by this module keep
+    them zero.
+
+    Args:
+        words: uint64 array of packed bits.
+        axis:  ``None`` for a grand total, or ``-1`` for per-row counts
+               of a 2-D (rows, words) array.
+
+    Returns:
+        Total number of set bits, or an int64 array of per-row counts.
+    """
+    if hasattr(np, "bitwise_count"):
+        counts = np.bitwise_count(words)
+    else:
+        counts = arena.get("popcount", words.shape, np.uint64)
+        tmp = arena.get("popcount_tmp", words.shape, np.uint64)
+        np.right_shift(words, np.uint64(1), out=counts)
+        counts &= _M1
+        np.subtract(words, counts, out=counts)
+        np.right_shift(counts, np.uint64(2), out=tmp)
+        tmp &= _M2
+        counts &= _M2
+        counts += tmp
+        np.right_shift(counts, np.uint64(4), out=tmp)
+        counts += tmp
+        counts &= _M4
+        counts *= _H01
+        counts >>= np.uint64(56)
+    total = counts.sum(axis=axis, dtype=np.int64)
+    return int(total) if axis is None else total
+
+
+def _lane_dtype(p: float) -> np.dtype:
+    """
+    Narrowest unsigned lane that represents ``p · 2^width`` exactly.
+
+    Dyadic probabilities such as ¼ or ⅜ need only 8 or 16 random bits
+    per trial for an exact comparison; anything else uses 32-bit lanes.
+    """
+    for dtype in (np.dtype(np.uint8), np.dtype(np.uint16)):
+        scaled = p * 2 ** (8 * dtype.itemsize)
+        if scaled == int(scaled):
+            return dtype
+    return np.dtype(np.uint32)
+
+
+def bernoulli_mask(n: int, p: float | np.ndarray, rng: Generator) -> np.ndarray:
+    """
+    Draw *n* independent Bernoulli(p) trials as a packed mask.
+
+    Each raw 64-bit draw supplies two 32-bit lanes; a lane succeeds when
+    it falls below ``p · 2³²``. This halves RNG memory traffic compared
+    with a float64 ``rng.random(n) < p`` and skips the float conversion.
+    A scalar dyadic *p* uses narrower lanes where that is still exact
+    (see ``_lane_dtype``), and p = ½ takes raw bits directly.
+
+    When *p* is an array, the stream is split into ``len(p)`` equal
+    segments (each a whole number of words) with one probability each.
+
+    Args:
+        n:   Number of trials.
+        p:   Success probability in [0, 1], scalar or per segment.
+        rng: NumPy random generator instance.
+
+    Returns:
+        1-D uint64 array of shape (ceil(n / 64),); padding bits are zero.
+    """
+    if np.ndim(p) == 0:
+        if p >= 1.0:
+            return pack_bits(np.ones(n, dtype=bool))
+        if p == 0.5:
+            words = rng_bits(n, rng)
+            words[-1:] &= tail_mask(n)
+            return words
+        dtype = _lane_dtype(p)
+        per_word = WORD_BITS // (8 * dtype.itemsize)
+        raw = rng.bit_generator.random_raw(size=-(-n // per_word))
+        mask = arena.get("bernoulli", n, bool)
+        np.less(raw.view(dtype)[:n], dtype.type(p * 2 ** (8 * dtype.itemsize)), out=mask)
+        return pack_bits(mask)
+
+    p = np.asarray(p, dtype=np.float64)
+    thresholds = np.minimum(p * 2**32, 2**32 - 1).astype(np.uint32)
+    lanes = rng.bit_generator.random_raw(size=(n + 1) // 2).view(np.uint32)[:n]
+    lanes = lanes.reshape(len(p), -1)
+    mask = arena.get("bernoulli", lanes.shape, bool)
+    np.less(lanes, thresholds[:, None], out=mask)
+    mask[p >= 1.0] = True
+    return pack_bits(mask.ravel())
+
+
+def bernoulli_positions(n: int, p: float, rng: Generator) -> np.ndarray:
+    """
+    Sample the positions of successes among *n* Bernoulli(p) trials.
+
+    Equivalent in distribution to ``bernoulli_mask``: the number of
+    successes is Binomial(n, p) and, given that count, every subset of
+    positions is equally likely. The cost is O(k) in the number of
+    successes rather than O(n), for p below ``SPARSE_P_MAX``.
+
+    Args:
+        n:   Number of trials.
+        p:   Success probability in [0, 1].
+        rng: NumPy random generator instance.
+
+    Returns:
+        Sorted int64 array of success positions.
+    """
+    k = rng.binomial(n, p)
+    return np.sort(rng.choice(n, size=k, replace=False, shuffle=False))
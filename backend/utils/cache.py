@@ -0,0 +1,52 @@
+"""
+Small in-memory LRU cache with a per-entry time to live.
+
+Used to keep the serialised responses of deterministic (seeded) requests
+so that repeating one is answered without re-running the simulation.
+Not thread-safe: use it from a single thread (e.g. the event loop).
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Least-recently-used mapping whose entries also expire after *ttl* s.
+
+    Args:
+        maxsize: Maximum number of entries kept.
+        ttl:     Seconds an entry stays valid after it is stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the live entry for *key* (marking it recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store *value* under *key*, evicting the least recently used entry."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
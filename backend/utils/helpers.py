@@ -2,11 +2,37 @@
 General-purpose utility functions for the QKD simulation engine.
 """
 
+import base64
+import os
+import threading
+from collections.abc import Sequence
+
 import numpy as np
-from numpy.random import Generator
+from numpy.random import SFC64, BitGenerator, Generator, SeedSequence
+
+from utils.bits import n_words, unpack_bits
+
+_local = threading.local()
+
+
+def _parent_seed_sequence() -> SeedSequence:
+    """
+    Per-thread, per-process root for unseeded generators.
+
+    Keyed on the process id as well as the thread: a forked worker
+    inherits its parent's state, and must not replay its children.
+    """
+    pid = os.getpid()
+    if getattr(_local, "pid", None) != pid:
+        _local.pid = pid
+        _local.parent = SeedSequence()
+    return _local.parent
 
 
-def create_rng(seed: int | None = None) -> Generator:
+def create_rng(
+    seed: int | SeedSequence | None = None,
+    bitgen: type[BitGenerator] = SFC64,
+) -> Generator:
     """
     Create a NumPy random number generator.
 
@@ -14,29 +40,89 @@ def create_rng(seed: int | None = None) -> Generator:
     and reproducible, which is essential for regression testing and
     debugging.
 
+    SFC64 is the default bit generator: the pipeline is dominated by
+    ``random_raw`` draws, where it is measurably faster than PCG-64,
+    and its statistical quality is ample for Monte Carlo simulation.
+
     Args:
-        seed: Optional integer seed. ``None`` → non-deterministic.
+        seed:   Optional integer seed or ``SeedSequence`` (e.g. a spawned
+                child). ``None`` → non-deterministic.
+        bitgen: Bit generator class (e.g. ``numpy.random.PCG64`` for
+                benchmarking against NumPy's default).
+
+    Unseeded generators are spawned from a cached root ``SeedSequence``
+    instead of gathering fresh OS entropy on every call.
 
     Returns:
-        A ``numpy.random.Generator`` instance (PCG-64 algorithm).
+        A ``numpy.random.Generator`` instance (SFC64 algorithm by default).
     """
-    return np.random.default_rng(seed)
+    if seed is None:
+        seed = _parent_seed_sequence().spawn(1)[0]
+    return Generator(bitgen(seed))
 
 
-def sample_bits(bits: np.ndarray, max_samples: int = 64) -> list[int]:
+def create_rng_batch(
+    seed: int | None,
+    count: int,
+    bitgen: type[BitGenerator] = SFC64,
+) -> list[Generator]:
+    """
+    Create *count* statistically independent generators from one seed.
+
+    The streams are the children of ``SeedSequence(seed)``, so a seeded
+    batch is reproducible, and no stream overlaps another.
+
+    Args:
+        seed:   Optional integer seed. ``None`` → non-deterministic.
+        count:  Number of generators.
+        bitgen: Bit generator class.
+
+    Returns:
+        List of ``numpy.random.Generator`` instances.
+    """
+    root = SeedSequence(seed) if seed is not None else _parent_seed_sequence()
+    return [Generator(bitgen(child)) for child in root.spawn(count)]
+
+
+def sample_bits(words: np.ndarray, n: int, max_samples: int = 64) -> list[int]:
     """
     Extract a bounded sample of bits for API response / UI display.
 
+    Only the leading ``ceil(max_samples / 64)`` words of the packed
+    stream are unpacked, however long the stream is. The {0, 1} bytes
+    are converted through the buffer protocol rather than per element.
+
     Args:
-        bits:        Source bit array.
+        words:       Packed bit stream (see ``utils.bits``).
+        n:           Logical length of the stream in bits.
         max_samples: Maximum number of bits to return.
 
     Returns:
         Python list of ints (0 or 1), length ≤ max_samples.
     """
-    return bits[:max_samples].tolist()
+    k = min(n, max_samples)
+    return list(unpack_bits(words[: n_words(k)], k).tobytes())
+
+
+def encode_bits(bits: Sequence[int]) -> str:
+    """
+    Encode a bit sample compactly for an API response.
+
+    The bits are packed eight per byte, most significant bit first
+    (``np.packbits`` order, zero-padded), then base64-encoded: 64 bits
+    become a 12-character string. The length is not encoded.
+
+    Args:
+        bits: Sequence of 0/1 ints (e.g. from ``sample_bits``).
+
+    Returns:
+        ASCII base64 string.
+    """
+    packed = np.packbits(np.frombuffer(bytes(bits), dtype=np.uint8))
+    return base64.b64encode(packed.tobytes()).decode("ascii")
 
 
 def clamp(value: float, lo: float, hi: float) -> float:
     """Clamp *value* into the closed interval [lo, hi]."""
-    return max(lo, min(hi, value))
+    # Comparisons instead of min()/max() calls: ~10x cheaper per call.
+    return lo if value < lo else (hi if value > hi else value)
@@ -54,6 +54,15 @@ def main():
         "--hidden-import", "uvicorn.lifespan",
         "--hidden-import", "uvicorn.lifespan.on",
         "--hidden-import", "uvicorn.lifespan.off",
+        # Tauri runs the sidecar as a single file, so the bundle stays
+        # one-file; keep it small, since it is unpacked on every launch.
+        "--noupx",
+        "--exclude-module", "tkinter",
+        "--exclude-module", "matplotlib",
+        "--exclude-module", "pytest",
+        "--exclude-module", "numpy.tests",
+        "--exclude-module", "numpy.f2py",
+        "--exclude-module", "numpy.distutils",
         str(BACKEND_DIR / "run_server.py"),
     ]
 
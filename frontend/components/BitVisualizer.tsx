@@ -5,7 +5,7 @@ import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/com
 import { Badge } from "@/components/ui/badge";
 import { HiOutlineKey, HiOutlineUser, HiOutlineExclamationTriangle } from "react-icons/hi2";
 import { TbBinary } from "react-icons/tb";
-import type { SimulationResponse } from "@/lib/api";
+import { decodeBits, type SimulationResponse } from "@/lib/api";
 
 interface BitVisualizerProps {
   result: SimulationResponse | null;
@@ -93,6 +93,13 @@ function BitGrid({
 }
 
 export default memo(function BitVisualizer({ result }: BitVisualizerProps) {
+  const aliceBits = result
+    ? decodeBits(result.raw_bits_sample_b64, Math.min(result.total_photons, 64))
+    : [];
+  const bobBits = result
+    ? decodeBits(result.bob_bits_sample_b64, Math.min(result.sifted_key_length, 64))
+    : [];
+
   return (
     <Card>
       <CardHeader className="pb-3">
@@ -114,14 +121,14 @@ export default memo(function BitVisualizer({ result }: BitVisualizerProps) {
             <BitGrid 
               title="Alice — Raw Key (first 64 bits)" 
               icon={<HiOutlineUser className="h-3 w-3" />}
-              bits={result.raw_bits_sample}
+              bits={aliceBits}
               color="sky"
             />
             <BitGrid
               title="Bob — Sifted Key (first 64 bits)"
               icon={<HiOutlineKey className="h-3 w-3" />}
-              bits={result.bob_bits_sample}
-              compareTo={result.raw_bits_sample.slice(0, result.bob_bits_sample.length)}
+              bits={bobBits}
+              compareTo={aliceBits.slice(0, bobBits.length)}
               color="violet"
             />
             <div className="flex items-center gap-4 text-[11px] text-muted-foreground pt-2 border-t">
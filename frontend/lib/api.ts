@@ -128,12 +128,32 @@ export interface SimulationResponse {
   total_photons: number;
   sifted_key_length: number;
   final_key_length: number;
+  /** @deprecated Use `raw_bits_sample_b64` with `decodeBits`. */
   raw_bits_sample: number[];
+  /** @deprecated Use `bob_bits_sample_b64` with `decodeBits`. */
   bob_bits_sample: number[];
+  /** Alice's raw bits, packed MSB-first and base64-encoded. */
+  raw_bits_sample_b64: string;
+  /** Bob's sifted key bits, packed MSB-first and base64-encoded. */
+  bob_bits_sample_b64: string;
   mismatches: number;
   security_status: "SECURE" | "COMPROMISED";
 }
 
+/**
+ * Unpack a base64 bit sample (bits packed MSB-first, eight per byte)
+ * into the first `length` bits as 0/1 numbers.
+ */
+export function decodeBits(b64: string, length: number): number[] {
+  const bytes = atob(b64);
+  const bits = Math.min(length, bytes.length * 8);
+  const out = new Array<number>(bits);
+  for (let i = 0; i < bits; i++) {
+    out[i] = (bytes.charCodeAt(i >> 3) >> (7 - (i & 7))) & 1;
+  }
+  return out;
+}
+
 export interface SweepRequest {
   photons: number;
   attenuation: number;